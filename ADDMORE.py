@@ -1,12 +1,13 @@
-digits = ['zero', 'one', 'two', 'three', 'four',
-          'five', 'six', 'seven', 'eight', 'nine']
+digits = ('zero', 'one', 'two', 'three', 'four',
+          'five', 'six', 'seven', 'eight', 'nine')
 
 # Read the phone number as a string
 phone_number = input("Enter the phone number: ")
 
-# Iterate over each character in the string
-for char in phone_number:
-    # Convert the character to integer index
-    index = int(char)
-    # Print the corresponding digit name
-    print(digits[index])
+# Validate once up front so the loop below needs no per-character checks
+# (isascii() rules out other scripts' digits, which isdigit() accepts)
+if not (phone_number.isascii() and phone_number.isdigit()):
+    raise ValueError("Phone number must contain only the digits 0-9.")
+
+# ord(char) - 48 turns '0'..'9' into 0..9; print all the names in one write
+print('\n'.join([digits[ord(char) - 48] for char in phone_number]))
@@ -1,61 +1,143 @@
 import csv
+import sys
 
-students = []
+try:
+    import numpy as np
+except ImportError:  # bulk scoring falls back to a plain Python loop
+    np = None
 
-while True:
-    print("\n--- New Student Entry ---")
+# Performance is stored as a small integer code in the compiled kernel
+PERFORMANCE_LABELS = ("EXCELLENT", "PASS", "FAIL")
 
-    name = input("Enter your name: ")
-    age_entering = int(input("Enter your age: "))
+# Below this many scores plain NumPy is as fast or faster once Numba's
+# import and cached-kernel load (~0.3 s per process) are counted
+NUMBA_MIN_ROWS = 30_000_000
 
-    if age_entering >= 20:
-        print("ADMITTANCE REJECTED. PLEASE \nFOLLOW THE STEPS TO RESCHEDULE ADMITTANCE.")
-    else:
-        print("CONGRATULATIONS! WE LOOK FORWARD TO WALKING WITH YOU.")
-
-    score_entered = float(input("Enter your score: "))
 
-    # Performance evaluation
-    if score_entered > 90:
+def classify(score):
+    # Performance evaluation and enrollment eligibility for one score
+    if score > 90:
         performance = "EXCELLENT"
-    elif 60 <= score_entered <= 89.9:
+    elif 60 <= score <= 89.9:
         performance = "PASS"
     else:
         performance = "FAIL"
+    return performance, score >= 60
+
+
+_classify_kernel = None
+
+
+def _get_classify_kernel():
+    # Numba is imported and the kernel built on first use only, so the
+    # interactive mode never pays for it; cache=True keeps the compiled
+    # kernel on disk between runs. Returns None if Numba is not installed.
+    global _classify_kernel
+    if _classify_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _classify_kernel = False
+            return None
+
+        @njit(parallel=True, cache=True)
+        def kernel(scores_arr, perf_codes, elig):
+            # One fused pass over the scores; codes index PERFORMANCE_LABELS
+            for i in prange(scores_arr.shape[0]):
+                score = scores_arr[i]
+                elig[i] = score >= 60
+                if score > 90:
+                    perf_codes[i] = 0
+                elif 60 <= score <= 89.9:
+                    perf_codes[i] = 1
+                else:
+                    perf_codes[i] = 2
+
+        _classify_kernel = kernel
+    return _classify_kernel or None
+
+
+def classify_scores(score_list):
+    # Same rules as classify(), applied to a whole column of scores at once
+    if np is None:
+        results = [classify(score) for score in score_list]
+        return [p for p, _ in results], [e for _, e in results]
+    scores_arr = np.asarray(score_list, dtype=np.float64)
+    kernel = _get_classify_kernel() if scores_arr.shape[0] >= NUMBA_MIN_ROWS else None
+    if kernel is not None:
+        perf_codes = np.empty(scores_arr.shape[0], dtype=np.int8)
+        eligible = np.empty(scores_arr.shape[0], dtype=np.bool_)
+        kernel(scores_arr, perf_codes, eligible)
+        return np.asarray(PERFORMANCE_LABELS)[perf_codes].tolist(), eligible.tolist()
+    performance = np.select(
+        [scores_arr > 90, (scores_arr >= 60) & (scores_arr <= 89.9)],
+        ["EXCELLENT", "PASS"],
+        default="FAIL",
+    )
+    eligible = scores_arr >= 60
+    return performance.tolist(), eligible.tolist()
+
+
+fieldnames = ["name", "age", "score", "performance", "eligible"]
+
+# One list per column (same order as fieldnames)
+names = []
+ages = []
+scores = []
+performances = []
+eligibles = []
+
+# Bulk-scoring mode: python MAN.py students_in.csv (columns name, age, score)
+source = sys.argv[1] if len(sys.argv) > 1 else None
+
+if source:
+    # Read every row first, then classify all scores in one pass
+    with open(source, newline="") as f:
+        for row in csv.DictReader(f):
+            names.append(row["name"])
+            ages.append(int(row["age"]))
+            scores.append(float(row["score"]))
+    performances, eligibles = classify_scores(scores)
+else:
+    while True:
+        print("\n--- New Student Entry ---")
+
+        name = input("Enter your name: ")
+        age_entering = int(input("Enter your age: "))
 
-    print(f"Performance: {performance}")
+        if age_entering >= 20:
+            print("ADMITTANCE REJECTED. PLEASE \nFOLLOW THE STEPS TO RESCHEDULE ADMITTANCE.")
+        else:
+            print("CONGRATULATIONS! WE LOOK FORWARD TO WALKING WITH YOU.")
 
-    # Enrollment eligibility
-    eligible = score_entered >= 60
-    print("Enrollment Eligibility:", eligible)
+        score_entered = float(input("Enter your score: "))
 
-    # Store student data
-    student_data = {
-        "name": name,
-        "age": age_entering,
-        "score": score_entered,
-        "performance": performance,
-        "eligible": eligible
-    }
+        performance, eligible = classify(score_entered)
+        print(f"Performance: {performance}")
+        print("Enrollment Eligibility:", eligible)
 
-    students.append(student_data)
+        # Store student data
+        names.append(name)
+        ages.append(age_entering)
+        scores.append(score_entered)
+        performances.append(performance)
+        eligibles.append(eligible)
 
-    # Ask if user wants to continue
-    continue_input = input("Do you want to enter another student? (yes/no): ").lower()
-    if continue_input != "yes":
-        break
+        # Ask if user wants to continue
+        continue_input = input("Do you want to enter another student? (yes/no): ").lower()
+        if continue_input != "yes":
+            break
 
 # After loop, print all student summaries
 print("\n=== Summary of All Students Entered ===")
-for s in students:
-    print(f"{s['name']} (Age {s['age']}) - Score: {s['score']}, Performance: {s['performance']}, Eligible: {s['eligible']}")
+for name, age, score, performance, eligible in zip(names, ages, scores, performances, eligibles):
+    print(f"{name} (Age {age}) - Score: {score}, Performance: {performance}, Eligible: {eligible}")
 
 # Save to CSV file
-with open("students.csv", "w", newline="") as csvfile:
-    fieldnames = ["name", "age", "score", "performance", "eligible"]
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+with open("students.csv", "w", newline="", buffering=65536) as csvfile:
+    writer = csv.writer(csvfile)
 
-    writer.writeheader()
-    writer.writerows(students)
+    writer.writerow(fieldnames)
+    writer.writerows(zip(names, ages, scores, performances, eligibles))
 
 print("\nAll student data has been saved to 'students.csv'.")
@@ -13,77 +13,261 @@ import sqlite3
 import datetime
 import csv
 import os
+import re
+import itertools
+import math
+import contextlib
 
 DB_FILENAME = "sensor_data.db"
 
+# UPDATE ... RETURNING needs SQLite 3.35+.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Pre-validate numeric input so well-formed values skip the try/except path.
+_FLOAT_RE = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+
+_now = datetime.datetime.now
+
+
+def now_str():
+    # Same output as strftime("%Y-%m-%d %H:%M:%S") without going through the
+    # locale-aware format parser on every insert.
+    n = _now()
+    return f"{n.year:04d}-{n.month:02d}-{n.day:02d} {n.hour:02d}:{n.minute:02d}:{n.second:02d}"
+
 
 # -----------------------
 # Database handler class
 # -----------------------
 class SensorDB:
+    # SQL text is kept in one place so every call site hits the same entry
+    # in the connection's statement cache.
+    _INSERT_SQL = """
+        INSERT INTO sensor_data (sensor_name, value, unit, timestamp, status)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _SELECT_ALL_SQL = "SELECT * FROM sensor_data ORDER BY id"
+    _SELECT_ONE_SQL = "SELECT * FROM sensor_data WHERE id = ?"
+    _UPDATE_SQL = """
+        UPDATE sensor_data
+        SET sensor_name=?, value=?, unit=?, timestamp=?, status=?
+        WHERE id=?
+    """
+    _UPDATE_RETURNING_SQL = """
+        UPDATE sensor_data
+        SET sensor_name=?, value=?, unit=?, timestamp=?, status=?
+        WHERE id=?
+        RETURNING id, sensor_name, CAST(value AS REAL) AS value, unit, timestamp, status
+    """
+    _DELETE_SQL = "DELETE FROM sensor_data WHERE id=?"
+    _EXPORT_SQL = "SELECT id, sensor_name, value, unit, timestamp, status FROM sensor_data ORDER BY id"
+    # import_csv_fast() stages rows in an attached in-memory database.
+    _STAGE_CREATE_SQL = "CREATE TABLE stage.sensor_data (sensor_name, value, unit, timestamp, status)"
+    _STAGE_INSERT_SQL = "INSERT INTO stage.sensor_data (sensor_name, value, unit, timestamp, status) VALUES (?, ?, ?, ?, ?)"
+    _STAGE_COPY_SQL = """
+        INSERT INTO main.sensor_data (sensor_name, value, unit, timestamp, status)
+        SELECT sensor_name, value, unit, timestamp, status FROM stage.sensor_data ORDER BY rowid
+    """
+
+    # WAL + synchronous=NORMAL turns each commit into a log append instead of
+    # a full fsync of the database file. journal_mode cannot be changed inside
+    # a transaction, so the pragmas run before the schema's BEGIN.
+    _PRAGMA_SQL = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA mmap_size=134217728;
+        PRAGMA busy_timeout=5000;
+    """
+    _SCHEMA_SQL = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS sensor_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sensor_name TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sensor_name ON sensor_data(sensor_name);
+        CREATE INDEX IF NOT EXISTS idx_sensor_ts ON sensor_data(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_sensor_status ON sensor_data(status);
+        COMMIT;
+    """
+
     def __init__(self, db_file=DB_FILENAME):
-        self.conn = sqlite3.connect(db_file)
+        self.conn = sqlite3.connect(db_file, cached_statements=256, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
-        self._create_table()
-
-    def _create_table(self):
-        with self.conn:
-            self.conn.execute("""
-                CREATE TABLE IF NOT EXISTS sensor_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sensor_name TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    unit TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    status TEXT NOT NULL
-                )
-            """)
+        self.conn.executescript(self._PRAGMA_SQL + self._SCHEMA_SQL)
+
+    # The connection runs in autocommit mode (isolation_level=None); group
+    # related writes explicitly so they share a single commit:
+    #
+    #     with db.transaction():
+    #         db.add_reading(...); db.update_reading(...)
+    #
+    # transaction() nests: inside an open transaction (including one started
+    # with begin()) it joins it, so the outermost block commits or rolls back.
+    def begin(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        if self.conn.in_transaction:
+            yield self.conn
+            return
+        self.begin()
+        try:
+            yield self.conn
+        except BaseException:
+            self.rollback()
+            raise
+        else:
+            self.commit()
 
     def add_reading(self, sensor_name, value, unit, timestamp=None, status="Normal"):
         if timestamp is None:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self.conn:
-            cursor = self.conn.execute("""
-                INSERT INTO sensor_data (sensor_name, value, unit, timestamp, status)
-                VALUES (?, ?, ?, ?, ?)
-            """, (sensor_name.strip(), value, unit.strip(), timestamp, status.strip()))
-        return cursor.lastrowid
+            timestamp = now_str()
+        self.add_readings_bulk([(sensor_name.strip(), value, unit.strip(), timestamp, status.strip())])
+        # executemany() leaves cursor.lastrowid unset, so ask the connection.
+        return self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    def add_readings_bulk(self, rows):
+        # rows: iterable of (sensor_name, value, unit, timestamp, status) tuples;
+        # a generator is fine. All rows are inserted in a single transaction.
+        # A timestamp of None is filled with the time the batch started.
+        now = now_str()
+        rows = (r if r[3] is not None else (r[0], r[1], r[2], now, r[4]) for r in rows)
+        with self.transaction():
+            cursor = self.conn.executemany(self._INSERT_SQL, rows)
+        return cursor.rowcount
+
+    def _csv_rows(self, f):
+        # Expects the layout written by export_to_csv(); an "id" column, if
+        # present, is ignored so the rows get fresh ids.
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty.")
+        cols = [c.strip() for c in header]
+        try:
+            idx = [cols.index(c) for c in ("sensor_name", "value", "unit", "timestamp", "status")]
+        except ValueError:
+            raise ValueError("CSV header must contain sensor_name, value, unit, timestamp and status.")
+        now = now_str()
+
+        def parse():
+            for r in reader:
+                if not r:
+                    continue
+                try:
+                    row = (r[idx[0]].strip(), float(r[idx[1]]), r[idx[2]].strip(),
+                           r[idx[3]].strip() or now, r[idx[4]].strip())
+                    # nan is stored as NULL and trips NOT NULL; reject inf too
+                    if not math.isfinite(row[1]):
+                        raise ValueError("value must be a finite number")
+                except IndexError:
+                    raise ValueError(f"CSV line {reader.line_num} has too few columns.")
+                except ValueError as e:
+                    raise ValueError(f"Invalid value on CSV line {reader.line_num}: {e}")
+                yield row
+
+        return parse()
+
+    def import_csv(self, csv_path, batch=10000):
+        count = 0
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = self._csv_rows(f)
+            with self.transaction():
+                while True:
+                    chunk = list(itertools.islice(rows, batch))
+                    if not chunk:
+                        break
+                    self.conn.executemany(self._INSERT_SQL, chunk)
+                    count += len(chunk)
+        return count
+
+    def import_csv_fast(self, csv_path):
+        # Parses the CSV into an attached :memory: staging table, so none of
+        # the per-row inserts touch the disk, then copies the staged rows
+        # into the real table with one INSERT ... SELECT in a normal write
+        # transaction. Only the new rows are held in RAM, and concurrent
+        # writers are safe because the database file is never replaced.
+        self.conn.execute("ATTACH DATABASE ':memory:' AS stage")
+        try:
+            self.conn.execute(self._STAGE_CREATE_SQL)
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                # One deferred transaction for the staging inserts (autocommit
+                # would commit every row); it only writes to "stage", so the
+                # main database is not locked while the CSV is parsed.
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.executemany(self._STAGE_INSERT_SQL, self._csv_rows(f))
+                except BaseException:
+                    self.rollback()
+                    raise
+                self.commit()
+            with self.transaction():
+                count = self.conn.execute(self._STAGE_COPY_SQL).rowcount
+        finally:
+            self.conn.execute("DETACH DATABASE stage")
+        return count
 
     def get_all_readings(self):
-        cursor = self.conn.execute("SELECT * FROM sensor_data ORDER BY id")
+        cursor = self.conn.execute(self._SELECT_ALL_SQL)
         return cursor.fetchall()
 
     def get_reading(self, reading_id):
-        cursor = self.conn.execute("SELECT * FROM sensor_data WHERE id = ?", (reading_id,))
+        cursor = self.conn.execute(self._SELECT_ONE_SQL, (reading_id,))
         return cursor.fetchone()
 
     def update_reading(self, reading_id, sensor_name, value, unit, timestamp, status):
-        with self.conn:
-            cursor = self.conn.execute("""
-                UPDATE sensor_data
-                SET sensor_name=?, value=?, unit=?, timestamp=?, status=?
-                WHERE id=?
-            """, (sensor_name.strip(), value, unit.strip(), timestamp.strip(), status.strip(), reading_id))
-        return cursor.rowcount > 0
+        # Returns the updated row, or None if no reading has that id.
+        params = (sensor_name.strip(), value, unit.strip(), timestamp.strip(), status.strip(), reading_id)
+        with self.transaction():
+            if _HAS_RETURNING:
+                return self.conn.execute(self._UPDATE_RETURNING_SQL, params).fetchone()
+            cursor = self.conn.execute(self._UPDATE_SQL, params)
+            if cursor.rowcount == 0:
+                return None
+            return self.get_reading(reading_id)
 
     def delete_reading(self, reading_id):
-        with self.conn:
-            cursor = self.conn.execute("DELETE FROM sensor_data WHERE id=?", (reading_id,))
+        with self.transaction():
+            cursor = self.conn.execute(self._DELETE_SQL, (reading_id,))
         return cursor.rowcount > 0
 
-    def export_to_csv(self, csv_path="sensor_log.csv"):
-        rows = self.get_all_readings()
-        if not rows:
+    def export_to_csv(self, csv_path="sensor_log.csv", chunk_size=1000):
+        # Plain tuples are enough for csv; skip building sqlite3.Row objects.
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(self._EXPORT_SQL)
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
             raise ValueError("No sensor data to export.")
         with open(csv_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow(["id", "sensor_name", "value", "unit", "timestamp", "status"])
-            for r in rows:
-                writer.writerow([r["id"], r["sensor_name"], r["value"], r["unit"], r["timestamp"], r["status"]])
+            writer.writerow([d[0] for d in cursor.description])
+            while chunk:
+                writer.writerows(chunk)
+                chunk = cursor.fetchmany(chunk_size)
 
     def close(self):
         self.conn.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 
 # -----------------------
 # Helper functions
@@ -97,47 +281,62 @@ def input_nonempty(prompt):
 
 def input_float(prompt):
     while True:
-        try:
-            return float(input(prompt).strip())
-        except ValueError:
+        s = input(prompt).strip()
+        if not _FLOAT_RE.match(s):
             print("⚠ Please enter a valid number.")
+            continue
+        return float(s)
 
 def confirm(prompt):
     return input(prompt + " (y/n): ").strip().lower() in ("y", "yes")
 
 
+_RULE = "-" * 40
+
+
+def format_reading(row):
+    return (
+        f"ID: {row['id']}\n"
+        f"  Sensor   : {row['sensor_name']}\n"
+        f"  Value    : {row['value']} {row['unit']}\n"
+        f"  Time     : {row['timestamp']}\n"
+        f"  Status   : {row['status']}\n"
+        f"{_RULE}"
+    )
+
+
 def print_reading(row):
-    print(f"ID: {row['id']}")
-    print(f"  Sensor   : {row['sensor_name']}")
-    print(f"  Value    : {row['value']} {row['unit']}")
-    print(f"  Time     : {row['timestamp']}")
-    print(f"  Status   : {row['status']}")
-    print("-" * 40)
+    print(format_reading(row))
 
 
 # -----------------------
 # Menu functions
 # -----------------------
-def add_reading_flow(db):
+# Each flow opens its own short-lived connection around the database calls,
+# so nothing is held open while waiting on input(). With WAL the reopen is
+# cheap.
+def add_reading_flow(db_file=DB_FILENAME):
     print("\n-- Add Sensor Reading --")
     sensor_name = input_nonempty("Sensor name: ")
     value = input_float("Sensor value: ")
     unit = input_nonempty("Unit (e.g., °C, kPa, m/s²): ")
     status = input_nonempty("Status (Normal/Warning/Error): ")
-    rid = db.add_reading(sensor_name, value, unit, status=status)
+    with SensorDB(db_file) as db:
+        rid = db.add_reading(sensor_name, value, unit, status=status)
     print(f"✅ Reading added with ID {rid}")
 
-def view_readings_flow(db):
-    rows = db.get_all_readings()
+def view_readings_flow(db_file=DB_FILENAME):
+    with SensorDB(db_file) as db:
+        rows = db.get_all_readings()
     if not rows:
         print("📭 No sensor readings found.")
         return
-    for r in rows:
-        print_reading(r)
+    print("\n".join(map(format_reading, rows)))
 
-def update_reading_flow(db):
+def update_reading_flow(db_file=DB_FILENAME):
     rid = int(input("Enter reading ID to update: "))
-    row = db.get_reading(rid)
+    with SensorDB(db_file) as db:
+        row = db.get_reading(rid)
     if not row:
         print("⚠ Reading not found.")
         return
@@ -147,29 +346,36 @@ def update_reading_flow(db):
     value = input_float(f"New value [{row['value']}]: ") or row['value']
     unit = input_nonempty(f"New unit [{row['unit']}]: ") or row['unit']
     status = input_nonempty(f"New status [{row['status']}]: ") or row['status']
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    if db.update_reading(rid, sensor_name, value, unit, timestamp, status):
+    timestamp = now_str()
+    with SensorDB(db_file) as db:
+        updated = db.update_reading(rid, sensor_name, value, unit, timestamp, status)
+    if updated:
         print("✅ Reading updated successfully.")
+        print_reading(updated)
     else:
         print("⚠ Failed to update reading.")
 
-def delete_reading_flow(db):
+def delete_reading_flow(db_file=DB_FILENAME):
     rid = int(input("Enter reading ID to delete: "))
-    row = db.get_reading(rid)
+    with SensorDB(db_file) as db:
+        row = db.get_reading(rid)
     if not row:
         print("⚠ Reading not found.")
         return
     print_reading(row)
     if confirm("Are you sure you want to delete this reading?"):
-        if db.delete_reading(rid):
+        with SensorDB(db_file) as db:
+            deleted = db.delete_reading(rid)
+        if deleted:
             print("🗑 Deleted successfully.")
         else:
             print("⚠ Could not delete reading.")
 
-def export_flow(db):
+def export_flow(db_file=DB_FILENAME):
     path = input("Enter CSV filename [default: sensor_log.csv]: ").strip() or "sensor_log.csv"
     try:
-        db.export_to_csv(path)
+        with SensorDB(db_file) as db:
+            db.export_to_csv(path)
         print(f"✅ Data exported to {path}")
     except ValueError as e:
         print("⚠", e)
@@ -178,11 +384,9 @@ def export_flow(db):
 # -----------------------
 # Main Menu
 # -----------------------
-def menu():
-    db = SensorDB()
-    try:
-        while True:
-            print("""
+def menu(db_file=DB_FILENAME):
+    while True:
+        print("""
 --- Sensor Data Logger ---
 1. Add Sensor Reading
 2. View All Readings
@@ -191,24 +395,22 @@ def menu():
 5. Export to CSV
 6. Exit
 """)
-            choice = input("Choose an option (1-6): ").strip()
-            if choice == "1":
-                add_reading_flow(db)
-            elif choice == "2":
-                view_readings_flow(db)
-            elif choice == "3":
-                update_reading_flow(db)
-            elif choice == "4":
-                delete_reading_flow(db)
-            elif choice == "5":
-                export_flow(db)
-            elif choice == "6":
-                print("👋 Exiting program...")
-                break
-            else:
-                print("⚠ Invalid choice, try again.")
-    finally:
-        db.close()
+        choice = input("Choose an option (1-6): ").strip()
+        if choice == "1":
+            add_reading_flow(db_file)
+        elif choice == "2":
+            view_readings_flow(db_file)
+        elif choice == "3":
+            update_reading_flow(db_file)
+        elif choice == "4":
+            delete_reading_flow(db_file)
+        elif choice == "5":
+            export_flow(db_file)
+        elif choice == "6":
+            print("👋 Exiting program...")
+            break
+        else:
+            print("⚠ Invalid choice, try again.")
 
 
 if __name__ == "__main__":
@@ -12,36 +12,119 @@ import sqlite3
 import datetime
 import csv
 import os
-from typing import Optional, Tuple, List
+import re
+import itertools
+import math
+import contextlib
+from typing import Iterable, Iterator, Optional, Tuple, List
 
 DB_FILENAME = "orders.db"
 
+# UPDATE ... RETURNING needs SQLite 3.35+.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Pre-validate numeric input so well-formed values skip the try/except path.
+_INT_RE = re.compile(r"^[+-]?\d+$")
+_FLOAT_RE = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+
 
 # -----------------------
 # Database helper class
 # -----------------------
 class OrderDB:
+    # SQL text is kept in one place so every call site hits the same entry
+    # in the connection's statement cache.
+    _INSERT_SQL = """
+        INSERT INTO orders (customer_name, product, quantity, unit_price, order_date, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SELECT_ALL_SQL = "SELECT * FROM orders ORDER BY id"
+    _SELECT_ONE_SQL = "SELECT * FROM orders WHERE id = ?"
+    _UPDATE_SQL = """
+        UPDATE orders
+        SET customer_name = ?, product = ?, quantity = ?, unit_price = ?, order_date = ?, status = ?
+        WHERE id = ?
+    """
+    _UPDATE_RETURNING_SQL = """
+        UPDATE orders
+        SET customer_name = ?, product = ?, quantity = ?, unit_price = ?, order_date = ?, status = ?
+        WHERE id = ?
+        RETURNING id, customer_name, product, quantity, CAST(unit_price AS REAL) AS unit_price, order_date, status
+    """
+    _DELETE_SQL = "DELETE FROM orders WHERE id = ?"
+    _EXPORT_SQL = "SELECT id, customer_name, product, quantity, unit_price, order_date, status FROM orders ORDER BY id"
+    # import_csv_fast() stages rows in an attached in-memory database.
+    _STAGE_CREATE_SQL = "CREATE TABLE stage.orders (customer_name, product, quantity, unit_price, order_date, status)"
+    _STAGE_INSERT_SQL = "INSERT INTO stage.orders (customer_name, product, quantity, unit_price, order_date, status) VALUES (?, ?, ?, ?, ?, ?)"
+    _STAGE_COPY_SQL = """
+        INSERT INTO main.orders (customer_name, product, quantity, unit_price, order_date, status)
+        SELECT customer_name, product, quantity, unit_price, order_date, status FROM stage.orders ORDER BY rowid
+    """
+
+    # WAL + synchronous=NORMAL turns each commit into a log append instead of
+    # a full fsync of the database file. journal_mode cannot be changed inside
+    # a transaction, so the pragmas run before the schema's BEGIN.
+    _PRAGMA_SQL = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA mmap_size=134217728;
+        PRAGMA busy_timeout=5000;
+    """
+    _SCHEMA_SQL = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_name TEXT NOT NULL,
+            product TEXT NOT NULL,
+            quantity INTEGER NOT NULL CHECK(quantity > 0),
+            unit_price REAL NOT NULL CHECK(unit_price >= 0),
+            order_date TEXT NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_name);
+        CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(order_date);
+        CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+        COMMIT;
+    """
+
     def __init__(self, db_file: str = DB_FILENAME):
         self.db_file = db_file
-        self.conn = sqlite3.connect(self.db_file)
+        self.conn = sqlite3.connect(self.db_file, cached_statements=256, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
-        self._create_table()
-
-    def _create_table(self) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    customer_name TEXT NOT NULL,
-                    product TEXT NOT NULL,
-                    quantity INTEGER NOT NULL CHECK(quantity > 0),
-                    unit_price REAL NOT NULL CHECK(unit_price >= 0),
-                    order_date TEXT NOT NULL,
-                    status TEXT NOT NULL
-                )
-                """
-            )
+        self.conn.executescript(self._PRAGMA_SQL + self._SCHEMA_SQL)
+
+    # The connection runs in autocommit mode (isolation_level=None); group
+    # related writes explicitly so they share a single commit:
+    #
+    #     with db.transaction():
+    #         db.add_order(...); db.update_order(...)
+    #
+    # transaction() nests: inside an open transaction (including one started
+    # with begin()) it joins it, so the outermost block commits or rolls back.
+    def begin(self) -> None:
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        self.conn.rollback()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        if self.conn.in_transaction:
+            yield self.conn
+            return
+        self.begin()
+        try:
+            yield self.conn
+        except BaseException:
+            self.rollback()
+            raise
+        else:
+            self.commit()
 
     def add_order(
         self,
@@ -54,22 +137,110 @@ class OrderDB:
     ) -> int:
         if order_date is None:
             order_date = datetime.date.today().isoformat()
-        with self.conn:
-            cursor = self.conn.execute(
-                """
-                INSERT INTO orders (customer_name, product, quantity, unit_price, order_date, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (customer_name.strip(), product.strip(), quantity, unit_price, order_date, status.strip()),
+        self.add_orders_bulk(
+            [(customer_name.strip(), product.strip(), quantity, unit_price, order_date, status.strip())]
+        )
+        # executemany() leaves cursor.lastrowid unset, so ask the connection.
+        return self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    def add_orders_bulk(self, rows: Iterable[Tuple[str, str, int, float, str, str]]) -> int:
+        # rows: iterable of (customer_name, product, quantity, unit_price, order_date, status)
+        # tuples; a generator is fine. All rows are inserted in a single transaction.
+        with self.transaction():
+            cursor = self.conn.executemany(self._INSERT_SQL, rows)
+        return cursor.rowcount
+
+    def _csv_rows(self, f: Iterable[str]) -> Iterator[Tuple[str, str, int, float, str, str]]:
+        # Expects the layout written by export_to_csv(); an "id" column, if
+        # present, is ignored so the rows get fresh ids.
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty.")
+        cols = [c.strip() for c in header]
+        try:
+            idx = [
+                cols.index(c)
+                for c in ("customer_name", "product", "quantity", "unit_price", "order_date", "status")
+            ]
+        except ValueError:
+            raise ValueError(
+                "CSV header must contain customer_name, product, quantity, unit_price, order_date and status."
             )
-        return cursor.lastrowid
+        today = datetime.date.today().isoformat()
+
+        def parse() -> Iterator[Tuple[str, str, int, float, str, str]]:
+            for r in reader:
+                if not r:
+                    continue
+                try:
+                    row = (
+                        r[idx[0]].strip(),
+                        r[idx[1]].strip(),
+                        int(r[idx[2]]),
+                        float(r[idx[3]]),
+                        r[idx[4]].strip() or today,
+                        r[idx[5]].strip() or "pending",
+                    )
+                    # Mirror the table's CHECK/NOT NULL constraints so bad rows
+                    # are reported with their line number, not as IntegrityError
+                    if row[2] <= 0:
+                        raise ValueError("quantity must be greater than 0")
+                    if not math.isfinite(row[3]) or row[3] < 0:
+                        raise ValueError("unit_price must be a finite number >= 0")
+                except IndexError:
+                    raise ValueError(f"CSV line {reader.line_num} has too few columns.")
+                except ValueError as e:
+                    raise ValueError(f"Invalid value on CSV line {reader.line_num}: {e}")
+                yield row
+
+        return parse()
+
+    def import_csv(self, csv_path: str, batch: int = 10000) -> int:
+        count = 0
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = self._csv_rows(f)
+            with self.transaction():
+                while True:
+                    chunk = list(itertools.islice(rows, batch))
+                    if not chunk:
+                        break
+                    self.conn.executemany(self._INSERT_SQL, chunk)
+                    count += len(chunk)
+        return count
+
+    def import_csv_fast(self, csv_path: str) -> int:
+        # Parses the CSV into an attached :memory: staging table, so none of
+        # the per-row inserts touch the disk, then copies the staged rows
+        # into the real table with one INSERT ... SELECT in a normal write
+        # transaction. Only the new rows are held in RAM, and concurrent
+        # writers are safe because the database file is never replaced.
+        self.conn.execute("ATTACH DATABASE ':memory:' AS stage")
+        try:
+            self.conn.execute(self._STAGE_CREATE_SQL)
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                # One deferred transaction for the staging inserts (autocommit
+                # would commit every row); it only writes to "stage", so the
+                # main database is not locked while the CSV is parsed.
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.executemany(self._STAGE_INSERT_SQL, self._csv_rows(f))
+                except BaseException:
+                    self.rollback()
+                    raise
+                self.commit()
+            with self.transaction():
+                count = self.conn.execute(self._STAGE_COPY_SQL).rowcount
+        finally:
+            self.conn.execute("DETACH DATABASE stage")
+        return count
 
     def get_all_orders(self) -> List[sqlite3.Row]:
-        cursor = self.conn.execute("SELECT * FROM orders ORDER BY id")
+        cursor = self.conn.execute(self._SELECT_ALL_SQL)
         return cursor.fetchall()
 
     def get_order(self, order_id: int) -> Optional[sqlite3.Row]:
-        cursor = self.conn.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
+        cursor = self.conn.execute(self._SELECT_ONE_SQL, (order_id,))
         return cursor.fetchone()
 
     def update_order(
@@ -81,37 +252,47 @@ class OrderDB:
         unit_price: float,
         order_date: str,
         status: str,
-    ) -> bool:
-        with self.conn:
-            cursor = self.conn.execute(
-                """
-                UPDATE orders
-                SET customer_name = ?, product = ?, quantity = ?, unit_price = ?, order_date = ?, status = ?
-                WHERE id = ?
-                """,
-                (customer_name.strip(), product.strip(), quantity, unit_price, order_date.strip(), status.strip(), order_id),
-            )
-        return cursor.rowcount > 0
+    ) -> Optional[sqlite3.Row]:
+        # Returns the updated row, or None if no order has that id.
+        params = (customer_name.strip(), product.strip(), quantity, unit_price, order_date.strip(), status.strip(), order_id)
+        with self.transaction():
+            if _HAS_RETURNING:
+                return self.conn.execute(self._UPDATE_RETURNING_SQL, params).fetchone()
+            cursor = self.conn.execute(self._UPDATE_SQL, params)
+            if cursor.rowcount == 0:
+                return None
+            return self.get_order(order_id)
 
     def delete_order(self, order_id: int) -> bool:
-        with self.conn:
-            cursor = self.conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+        with self.transaction():
+            cursor = self.conn.execute(self._DELETE_SQL, (order_id,))
         return cursor.rowcount > 0
 
-    def export_to_csv(self, csv_path: str) -> None:
-        rows = self.get_all_orders()
-        if not rows:
+    def export_to_csv(self, csv_path: str, chunk_size: int = 1000) -> None:
+        # Plain tuples are enough for csv; skip building sqlite3.Row objects.
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(self._EXPORT_SQL)
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
             raise ValueError("No orders to export.")
         with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow(["id", "customer_name", "product", "quantity", "unit_price", "order_date", "status"])
-            for r in rows:
-                writer.writerow([r["id"], r["customer_name"], r["product"], r["quantity"], r["unit_price"], r["order_date"], r["status"]])
+            writer.writerow([d[0] for d in cursor.description])
+            while chunk:
+                writer.writerows(chunk)
+                chunk = cursor.fetchmany(chunk_size)
 
     def close(self) -> None:
         if self.conn:
             self.conn.close()
 
+    def __enter__(self) -> "OrderDB":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
 
 # -----------------------
 # Input helpers
@@ -127,27 +308,27 @@ def input_nonempty(prompt: str) -> str:
 def input_int(prompt: str, min_value: Optional[int] = None) -> int:
     while True:
         s = input(prompt).strip()
-        try:
-            v = int(s)
-            if min_value is not None and v < min_value:
-                print(f"Value must be at least {min_value}.")
-                continue
-            return v
-        except ValueError:
+        if not _INT_RE.match(s):
             print("Please enter a valid integer.")
+            continue
+        v = int(s)
+        if min_value is not None and v < min_value:
+            print(f"Value must be at least {min_value}.")
+            continue
+        return v
 
 
 def input_float(prompt: str, min_value: Optional[float] = None) -> float:
     while True:
         s = input(prompt).strip()
-        try:
-            v = float(s)
-            if min_value is not None and v < min_value:
-                print(f"Value must be at least {min_value}.")
-                continue
-            return v
-        except ValueError:
+        if not _FLOAT_RE.match(s):
             print("Please enter a valid number (e.g., 1500 or 1500.00).")
+            continue
+        v = float(s)
+        if min_value is not None and v < min_value:
+            print(f"Value must be at least {min_value}.")
+            continue
+        return v
 
 
 def input_date(prompt: str, default_iso: Optional[str] = None) -> str:
@@ -176,15 +357,24 @@ def confirm(prompt: str) -> bool:
 # -----------------------
 # Display helpers
 # -----------------------
+_RULE = "-" * 40
+
+
+def format_order_row(row: sqlite3.Row) -> str:
+    return (
+        f"ID: {row['id']}\n"
+        f"  Customer : {row['customer_name']}\n"
+        f"  Product  : {row['product']}\n"
+        f"  Quantity : {row['quantity']}\n"
+        f"  UnitPrice: {row['unit_price']}\n"
+        f"  Date     : {row['order_date']}\n"
+        f"  Status   : {row['status']}\n"
+        f"{_RULE}"
+    )
+
+
 def print_order_row(row: sqlite3.Row) -> None:
-    print(f"ID: {row['id']}")
-    print(f"  Customer : {row['customer_name']}")
-    print(f"  Product  : {row['product']}")
-    print(f"  Quantity : {row['quantity']}")
-    print(f"  UnitPrice: {row['unit_price']}")
-    print(f"  Date     : {row['order_date']}")
-    print(f"  Status   : {row['status']}")
-    print("-" * 40)
+    print(format_order_row(row))
 
 
 def list_orders(db: OrderDB) -> None:
@@ -193,14 +383,16 @@ def list_orders(db: OrderDB) -> None:
         print("No orders found.")
         return
     print(f"\nFound {len(rows)} order(s):\n" + "=" * 40)
-    for r in rows:
-        print_order_row(r)
+    print("\n".join(map(format_order_row, rows)))
 
 
 # -----------------------
 # Menu & flows
 # -----------------------
-def add_order_flow(db: OrderDB) -> None:
+# Each flow opens its own short-lived connection around the database calls,
+# so nothing is held open while waiting on input(). With WAL the reopen is
+# cheap.
+def add_order_flow(db_file: str = DB_FILENAME) -> None:
     print("\n-- Add New Order --")
     customer = input_nonempty("Customer name: ")
     product = input_nonempty("Product name: ")
@@ -209,19 +401,22 @@ def add_order_flow(db: OrderDB) -> None:
     today = datetime.date.today().isoformat()
     order_date = input_date(f"Order date [YYYY-MM-DD] (leave blank for {today}): ", default_iso=today)
     status = input_nonempty("Status (e.g., pending, shipped, cancelled) [default 'pending']: ") or "pending"
-    order_id = db.add_order(customer, product, quantity, unit_price, order_date, status)
+    with OrderDB(db_file) as db:
+        order_id = db.add_order(customer, product, quantity, unit_price, order_date, status)
     print(f"✅ Order added with ID {order_id}.")
 
 
-def view_orders_flow(db: OrderDB) -> None:
+def view_orders_flow(db_file: str = DB_FILENAME) -> None:
     print("\n-- View Orders --")
-    list_orders(db)
+    with OrderDB(db_file) as db:
+        list_orders(db)
 
 
-def update_order_flow(db: OrderDB) -> None:
+def update_order_flow(db_file: str = DB_FILENAME) -> None:
     print("\n-- Update Order --")
     order_id = input_int("Enter order ID to update: ", min_value=1)
-    existing = db.get_order(order_id)
+    with OrderDB(db_file) as db:
+        existing = db.get_order(order_id)
     if not existing:
         print("Order not found.")
         return
@@ -242,15 +437,15 @@ def update_order_flow(db: OrderDB) -> None:
         if not q_raw:
             new_quantity = existing["quantity"]
             break
-        try:
-            q = int(q_raw)
-            if q <= 0:
-                print("Quantity must be > 0.")
-                continue
-            new_quantity = q
-            break
-        except ValueError:
+        if not _INT_RE.match(q_raw):
             print("Please enter a valid integer.")
+            continue
+        q = int(q_raw)
+        if q <= 0:
+            print("Quantity must be > 0.")
+            continue
+        new_quantity = q
+        break
 
     # unit price
     while True:
@@ -258,38 +453,43 @@ def update_order_flow(db: OrderDB) -> None:
         if not p_raw:
             new_price = existing["unit_price"]
             break
-        try:
-            p = float(p_raw)
-            if p < 0:
-                print("Price cannot be negative.")
-                continue
-            new_price = p
-            break
-        except ValueError:
+        if not _FLOAT_RE.match(p_raw):
             print("Please enter a valid number.")
+            continue
+        p = float(p_raw)
+        if p < 0:
+            print("Price cannot be negative.")
+            continue
+        new_price = p
+        break
 
     today_iso = datetime.date.today().isoformat()
     new_date = input_date(f"Order date [{existing['order_date']}] (YYYY-MM-DD, leave blank to keep): ", default_iso=existing["order_date"])
     new_status = input(f"Status [{existing['status']}]: ").strip() or existing["status"]
 
-    updated = db.update_order(order_id, new_customer, new_product, new_quantity, new_price, new_date, new_status)
+    with OrderDB(db_file) as db:
+        updated = db.update_order(order_id, new_customer, new_product, new_quantity, new_price, new_date, new_status)
     if updated:
         print("✅ Order updated successfully.")
+        print_order_row(updated)
     else:
         print("⚠️ Failed to update order (no changes made?).")
 
 
-def delete_order_flow(db: OrderDB) -> None:
+def delete_order_flow(db_file: str = DB_FILENAME) -> None:
     print("\n-- Delete Order --")
     order_id = input_int("Enter order ID to delete: ", min_value=1)
-    existing = db.get_order(order_id)
+    with OrderDB(db_file) as db:
+        existing = db.get_order(order_id)
     if not existing:
         print("Order not found.")
         return
     print("Order to be deleted:")
     print_order_row(existing)
     if confirm("Are you sure you want to delete this order?"):
-        if db.delete_order(order_id):
+        with OrderDB(db_file) as db:
+            deleted = db.delete_order(order_id)
+        if deleted:
             print("✅ Order deleted.")
         else:
             print("⚠️ Could not delete order.")
@@ -297,12 +497,13 @@ def delete_order_flow(db: OrderDB) -> None:
         print("Deletion cancelled.")
 
 
-def export_flow(db: OrderDB) -> None:
+def export_flow(db_file: str = DB_FILENAME) -> None:
     print("\n-- Export Orders to CSV --")
     default_path = os.path.join(os.getcwd(), "orders_export.csv")
     path = input(f"CSV file path [default: {default_path}]: ").strip() or default_path
     try:
-        db.export_to_csv(path)
+        with OrderDB(db_file) as db:
+            db.export_to_csv(path)
         print(f"✅ Exported orders to {path}")
     except ValueError as e:
         print("⚠️", e)
@@ -310,8 +511,7 @@ def export_flow(db: OrderDB) -> None:
         print("An error occurred while exporting:", e)
 
 
-def menu_loop() -> None:
-    db = OrderDB()
+def menu_loop(db_file: str = DB_FILENAME) -> None:
     try:
         while True:
             print(
@@ -327,15 +527,15 @@ def menu_loop() -> None:
             )
             choice = input("Choose an option (1-6): ").strip()
             if choice == "1":
-                add_order_flow(db)
+                add_order_flow(db_file)
             elif choice == "2":
-                view_orders_flow(db)
+                view_orders_flow(db_file)
             elif choice == "3":
-                update_order_flow(db)
+                update_order_flow(db_file)
             elif choice == "4":
-                delete_order_flow(db)
+                delete_order_flow(db_file)
             elif choice == "5":
-                export_flow(db)
+                export_flow(db_file)
             elif choice == "6":
                 print("Goodbye 👋")
                 break
@@ -343,8 +543,6 @@ def menu_loop() -> None:
                 print("Invalid choice — enter a number between 1 and 6.")
     except KeyboardInterrupt:
         print("\nInterrupted — exiting.")
-    finally:
-        db.close()
 
 
 # -----------------------